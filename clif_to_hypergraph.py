@@ -6,35 +6,80 @@ Interchange Format) string into an EGHg (Existential Graph as a Hypergraph) mode
 This version ensures insertion order is preserved for all elements.
 
 The translation process involves several key steps:
-1.  **Parsing**: A Lark-based parser transforms the raw CLIF string into an
-    Abstract Syntax Tree (AST), which is easier to work with.
-2.  **Recursive Traversal**: The translator class walks this AST recursively,
-    processing each logical construct (e.g., 'and', 'not', 'exists').
-3.  **Scope Management**: A stack of scopes is maintained to correctly handle
+1.  **Parsing**: A single-pass regex tokenizer turns the raw CLIF string
+    directly into nested Python lists of atom strings.
+2.  **Traversal**: The translator class walks these lists with an explicit
+    work stack, dispatching each logical construct (e.g., 'and', 'not',
+    'exists') through an operator table.
+3.  **Scope Management**: A chain of scopes is maintained to correctly handle
     variable bindings introduced by quantifiers like 'exists' and 'forall'.
 4.  **Structure Building**: As the tree is traversed, corresponding nodes and
     hyperedges are created and added to the EGHg object, ensuring they are
     placed in the correct nested contexts (cuts).
 """
 
-import uuid
-from typing import Dict, Any, List, Optional
-
-from lark import Lark, Tree, Token
-from eg_hypergraph import EGHg, Node, Hyperedge, NodeId
-
-clif_grammar = r"""
-    ?start: sexpr
-    ?sexpr: atom | list
-    list: "(" sexpr* ")"
-    ?atom: SYMBOL | NUMBER | STRING | EQUALS
-    EQUALS: "="
-    SYMBOL: /[a-zA-Z_][a-zA-Z0-9_]*/
-    STRING: /"([^"]|\\")*"/
-    %import common.NUMBER
-    %import common.WS
-    %ignore WS
-"""
+import logging
+import re
+import sys
+from collections import ChainMap
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+
+from eg_hypergraph import EGHg, Node, Hyperedge, NodeId, EdgeId
+
+logger = logging.getLogger(__name__)
+
+# A parsed s-expression: either an atom string or a list of s-expressions.
+Sexpr = Union[str, List['Sexpr']]
+
+# CLIF lexemes, matched in one C-level scan. Strings keep their escapes but
+# lose the surrounding quotes; numbers and '=' are ordinary atoms.
+_TOKEN_RE = re.compile(r"""
+      (?P<ws>\s+)
+    | (?P<open>\()
+    | (?P<close>\))
+    | "(?P<string>(?:[^"\\]|\\.)*)"
+    | (?P<atom>[a-zA-Z_][a-zA-Z0-9_]*|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|=)
+""", re.VERBOSE)
+
+def _parse_sexpr(text: str) -> Sexpr:
+    """
+    Parses a single CLIF s-expression into nested Python lists of interned
+    atom strings, without building any intermediate tree objects.
+    """
+    root: List[Sexpr] = []
+    current = root
+    stack: List[List[Sexpr]] = []
+    pos = 0
+    for match in _TOKEN_RE.finditer(text):
+        if match.start() != pos: break
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == 'open':
+            stack.append(current)
+            new_list: List[Sexpr] = []
+            current.append(new_list)
+            current = new_list
+        elif kind == 'close':
+            if not stack: raise ValueError(f"Unbalanced ')' at position {match.start()}.")
+            current = stack.pop()
+        elif kind != 'ws':
+            # Atoms are interned so operator, scope and constant lookups hash
+            # and compare them by identity.
+            current.append(sys.intern(match.group(kind)))
+    if pos != len(text): raise ValueError(f"Unexpected character {text[pos]!r} at position {pos}.")
+    if stack: raise ValueError("Unbalanced '(': missing closing parenthesis.")
+    if len(root) != 1: raise ValueError(f"Expected a single s-expression, found {len(root)}.")
+    return root[0]
+
+def _atom_value(sexpr: Sexpr) -> Optional[str]:
+    """
+    Returns the atom an s-expression stands for, unwrapping one-element lists
+    so that (F) reads as the atom F. Returns None for anything else.
+    """
+    while isinstance(sexpr, list):
+        if len(sexpr) != 1: return None
+        sexpr = sexpr[0]
+    return sexpr
 
 class ClifToHypergraph:
     """
@@ -42,10 +87,23 @@ class ClifToHypergraph:
     the parsed s-expression tree.
     """
     def __init__(self):
-        """Initializes the translator with a parser and an empty graph."""
-        self.parser = Lark(clif_grammar, start='start')
+        """Initializes the translator with an empty graph."""
         self.eg = EGHg()
-        self.scopes: List[Dict[str, NodeId]] = [{}]
+        self.scopes: ChainMap = ChainMap()
+        # Constant nodes already created, keyed by (container id, name).
+        self._constants_by_container: Dict[Tuple[Optional[EdgeId], str], NodeId] = {}
+        # Pending (handler, sexpr, container) steps of the sentence being walked.
+        self._work: List[Tuple[Callable, Any, Optional[Hyperedge]]] = []
+        # Operator dispatch table; anything not listed is an atomic predicate.
+        self._operators = {
+            'and': self._visit_and,
+            'not': self._visit_not,
+            'exists': self._handle_quantifier,
+            'forall': self._handle_quantifier,
+            'or': self._visit_or,
+            '=': self._visit_equals,
+            'if': self._visit_if,
+        }
 
     def translate(self, clif_string: str) -> EGHg:
         """
@@ -59,147 +117,156 @@ class ClifToHypergraph:
         """
         clean_clif = clif_string.strip()
         if not clean_clif: return self.eg
-        tree = self.parser.parse(clean_clif)
-        self._visit(tree, container=None)
+        sexpr = _parse_sexpr(clean_clif)
+        self._visit(sexpr, container=None)
         return self.eg
 
     def _get_variable_node(self, name: str) -> NodeId:
-        """Finds a variable's NodeId by searching up the scope stack."""
-        for scope in reversed(self.scopes):
-            if name in scope: return scope[name]
+        """Finds a variable's NodeId by searching up the scope chain."""
+        node_id = self.scopes.get(name)
+        if node_id is not None: return node_id
         raise NameError(f"Variable '{name}' not found in any active scope.")
 
-    def _get_atom_value(self, tree_or_token) -> Optional[str]:
-        """Recursively drills down a tree to find a single token value."""
-        if isinstance(tree_or_token, Token):
-            return tree_or_token.value[1:-1] if tree_or_token.type == 'STRING' else tree_or_token.value
-        if isinstance(tree_or_token, Tree) and len(tree_or_token.children) == 1:
-            return self._get_atom_value(tree_or_token.children[0])
-        return None
-
-    def _get_rule_name(self, tree: Tree) -> Optional[str]:
-        """Robustly gets the grammar rule name from a Lark Tree."""
-        if not isinstance(tree, Tree): return None
-        data = tree.data
-        return data.value if isinstance(data, Token) else data if isinstance(data, str) else None
-
-    def _visit(self, tree: Tree, container: Optional[Hyperedge]):
-        """Dispatches to the correct handler based on the AST node type."""
-        if not isinstance(tree, Tree): return
-        rule_type = self._get_rule_name(tree)
-        if rule_type in ('start', 'sexpr') and tree.children:
-            self._visit(tree.children[0], container)
-        elif rule_type == 'list':
-            self._visit_list(tree, container)
-        elif rule_type == 'atom':
-            print(f"Warning: Standalone atom found: {tree.children[0].value}")
-
-    def _visit_term(self, term_sexpr: Tree, container: Optional[Hyperedge]) -> NodeId:
+    def _visit(self, sexpr: Sexpr, container: Optional[Hyperedge]):
+        """
+        Walks a sentence with an explicit work stack rather than recursion, so
+        deeply nested input does not grow the Python call stack. Handlers push
+        their sub-sentences (and any follow-up steps) in reverse order.
+        """
+        work = self._work = [(self._visit_sexpr, sexpr, container)]
+        while work:
+            handler, sexpr, container = work.pop()
+            handler(sexpr, container)
+
+    def _visit_sexpr(self, sexpr: Sexpr, container: Optional[Hyperedge]):
+        """Dispatches a single sentence to the list handler."""
+        if isinstance(sexpr, str):
+            logger.warning("Standalone atom found: %s", sexpr)
+            return
+        self._visit_list(sexpr, container)
+
+    def _visit_in_new_cut(self, sexpr: Sexpr, container: Optional[Hyperedge]):
+        """Opens a plain cut in the container and visits the sentence inside it."""
+        cut = self.eg.add_cut(container)
+        self._work.append((self._visit_sexpr, sexpr, cut))
+
+    def _pop_scope(self, sexpr: None, container: None):
+        """Closes the innermost quantifier scope once its body has been walked."""
+        self.scopes = self.scopes.parents
+
+    def _visit_term(self, term_sexpr: Sexpr, container: Optional[Hyperedge]) -> NodeId:
         """
         Processes a term, which can be a simple atom (variable/constant) or a
         complex functional term. Returns the NodeId representing the term.
         """
-        # Case 1: The term is a simple atom.
-        term_name = self._get_atom_value(term_sexpr)
+        # Case 1: The term is a simple atom, possibly wrapped as (a).
+        term_name = _atom_value(term_sexpr)
         if term_name:
             try:
                 return self._get_variable_node(term_name)
             except NameError:
                 # Reuse existing constant node if one with the same name exists
                 # in the current context.
-                for node_id, node in self.eg.nodes.items():
-                    if node.type == 'constant' and node.properties.get('name') == term_name and self.eg.containment.get(node_id) == (container.id if container else None):
-                        return node_id
-                return self.eg.add_node(Node(node_type='constant', props={'name': term_name}), container).id
+                key = (container.id if container else None, term_name)
+                node_id = self._constants_by_container.get(key)
+                if node_id is None:
+                    node_id = self.eg.add_node(Node(node_type='constant', props={'name': term_name}), container).id
+                    self._constants_by_container[key] = node_id
+                return node_id
+
+        # An empty string literal names nothing.
+        if isinstance(term_sexpr, str): raise ValueError(f"Invalid term structure: {term_sexpr!r}")
 
         # Case 2: The term is a functional term, e.g., (FatherOf Cain).
-        list_node = None
-        rule_name = self._get_rule_name(term_sexpr)
-        if rule_name == 'sexpr' and term_sexpr.children:
-            list_node = term_sexpr.children[0]
-        elif rule_name == 'list':
-            list_node = term_sexpr
-
-        if list_node and self._get_rule_name(list_node) == 'list':
-            if not list_node.children: raise ValueError("Functional term cannot be empty.")
-            function_name = self._get_atom_value(list_node.children[0])
-            arg_sexprs = list_node.children[1:]
-            # Create a new node to represent the output of the function.
-            output_node = self.eg.add_node(Node(node_type='variable', props={'source_function': function_name}), container)
-            # Recursively process arguments.
-            arg_nodes = [self._visit_term(arg, container) for arg in arg_sexprs]
-            # Create the function hyperedge. Convention: output node is first.
-            self.eg.add_edge(Hyperedge(edge_type='function', nodes=[output_node.id] + arg_nodes, props={'name': function_name}), container)
-            return output_node.id
-
-        raise ValueError(f"Invalid term structure: {term_sexpr}")
-
-    def _visit_list(self, list_tree: Tree, container: Optional[Hyperedge]):
+        if not term_sexpr: raise ValueError("Functional term cannot be empty.")
+        function_name = _atom_value(term_sexpr[0])
+        if not function_name: raise ValueError(f"Invalid term structure: {term_sexpr}")
+        arg_sexprs = term_sexpr[1:]
+        # Create a new node to represent the output of the function.
+        output_node = self.eg.add_node(Node(node_type='variable', props={'source_function': function_name}), container)
+        # Recursively process arguments.
+        arg_nodes = [self._visit_term(arg, container) for arg in arg_sexprs]
+        # Create the function hyperedge. Convention: output node is first.
+        self.eg.add_edge(Hyperedge(edge_type='function', nodes=[output_node.id] + arg_nodes, props={'name': function_name}), container)
+        return output_node.id
+
+    def _visit_list(self, list_sexpr: List[Sexpr], container: Optional[Hyperedge]):
         """Handles a list expression like (operator ...args)."""
-        if not list_tree.children: return
-        operator = self._get_atom_value(list_tree.children[0])
-        if operator is None: raise ValueError(f"Invalid operator: {list_tree.children[0]}.")
-        args = list_tree.children[1:]
-
-        if operator == 'and':
-            for arg in args: self._visit(arg, container)
-        elif operator == 'not':
-            if len(args) != 1: raise ValueError("'not' expects one argument")
-            cut = self.eg.add_edge(Hyperedge(edge_type='cut', nodes=[]), container)
-            self._visit(args[0], cut)
-        elif operator in ('exists', 'forall'):
-            self._handle_quantifier(operator, args, container)
-        elif operator == 'or':
-            outer_cut = self.eg.add_edge(Hyperedge(edge_type='cut', nodes=[], props={'clif_construct': 'or'}), container)
-            for arg in args:
-                inner_cut = self.eg.add_edge(Hyperedge(edge_type='cut', nodes=[]), outer_cut)
-                self._visit(arg, inner_cut)
-        elif operator == '=':
-            if len(args) != 2: raise ValueError("'=' expects two arguments")
-            nodes = [self._visit_term(arg, container) for arg in args]
-            self.eg.add_edge(Hyperedge(edge_type='predicate', nodes=nodes, props={'name': 'equals'}), container)
-        elif operator == 'if':
-            if len(args) != 2: raise ValueError("'if' expects two arguments")
-            p_sexpr, q_sexpr = args[0], args[1]
-            outer_cut = self.eg.add_edge(Hyperedge(edge_type='cut', nodes=[], props={'clif_construct': 'if'}), container)
-            self._visit(p_sexpr, outer_cut)
-            inner_cut = self.eg.add_edge(Hyperedge(edge_type='cut', nodes=[]), outer_cut)
-            self._visit(q_sexpr, inner_cut)
-        else:
+        if not list_sexpr: return
+        operator = _atom_value(list_sexpr[0])
+        if operator is None: raise ValueError(f"Invalid operator: {list_sexpr[0]}.")
+        args = list_sexpr[1:]
+        handler = self._operators.get(operator)
+        if handler is None:
             self._visit_atom_predicate(operator, args, container)
+        else:
+            handler(operator, args, container)
+
+    def _visit_and(self, operator: str, args: List[Sexpr], container: Optional[Hyperedge]):
+        """Handles (and ...): every conjunct lives in the current context."""
+        visit = self._visit_sexpr
+        self._work.extend((visit, arg, container) for arg in reversed(args))
 
-    def _get_var_sexprs(self, vars_list_node: Tree, operator: str) -> List[Tree]:
-        """Helper to robustly extract the list of variable s-expressions from a quantifier."""
-        var_sexprs = None
-        node_rule = self._get_rule_name(vars_list_node)
-        if node_rule == 'sexpr' and vars_list_node.children:
-            list_node = vars_list_node.children[0]
-            if self._get_rule_name(list_node) == 'list': var_sexprs = list_node.children
-        elif node_rule == 'list': var_sexprs = vars_list_node.children
-        if var_sexprs is None: raise ValueError(f"Invalid variable list for '{operator}': {vars_list_node}")
-        return var_sexprs
-
-    def _handle_quantifier(self, operator: str, args: List[Tree], container: Optional[Hyperedge]):
+    def _visit_not(self, operator: str, args: List[Sexpr], container: Optional[Hyperedge]):
+        """Handles (not P) as a cut around P."""
+        if len(args) != 1: raise ValueError("'not' expects one argument")
+        self._visit_in_new_cut(args[0], container)
+
+    def _visit_or(self, operator: str, args: List[Sexpr], container: Optional[Hyperedge]):
+        """Handles (or P Q ...) as (not (and (not P) (not Q) ...))."""
+        outer_cut = self.eg.add_cut(container, {'clif_construct': 'or'})
+        visit = self._visit_in_new_cut
+        self._work.extend((visit, arg, outer_cut) for arg in reversed(args))
+
+    def _visit_equals(self, operator: str, args: List[Sexpr], container: Optional[Hyperedge]):
+        """Handles (= a b) as an 'equals' predicate."""
+        if len(args) != 2: raise ValueError("'=' expects two arguments")
+        left = self._visit_term(args[0], container)
+        right = self._visit_term(args[1], container)
+        self.eg.add_edge(Hyperedge(edge_type='predicate', nodes=[left, right], props={'name': 'equals'}), container)
+
+    def _visit_if(self, operator: str, args: List[Sexpr], container: Optional[Hyperedge]):
+        """Handles (if P Q) as (not (and P (not Q)))."""
+        if len(args) != 2: raise ValueError("'if' expects two arguments")
+        p_sexpr, q_sexpr = args[0], args[1]
+        outer_cut = self.eg.add_cut(container, {'clif_construct': 'if'})
+        # The consequent's cut is opened only after the antecedent is walked.
+        self._work.append((self._visit_in_new_cut, q_sexpr, outer_cut))
+        self._work.append((self._visit_sexpr, p_sexpr, outer_cut))
+
+    def _handle_quantifier(self, operator: str, args: List[Sexpr], container: Optional[Hyperedge]):
         """Handles 'exists' and 'forall' quantifiers."""
         if len(args) != 2: raise ValueError(f"'{operator}' expects two arguments")
-        vars_list_node, body_sexpr = args[0], args[1]
-        var_sexprs = self._get_var_sexprs(vars_list_node, operator)
-        var_names = [self._get_atom_value(node) for node in var_sexprs]
+        vars_list, body_sexpr = args[0], args[1]
+        if not isinstance(vars_list, list): raise ValueError(f"Invalid variable list for '{operator}': {vars_list}")
+        var_names = [_atom_value(name) for name in vars_list]
         
         if operator == 'exists':
-            new_scope = {name: self.eg.add_node(Node(node_type='variable', props={'name': name}), container).id for name in var_names if name}
-            self.scopes.append(new_scope)
-            self._visit(body_sexpr, container)
-            self.scopes.pop()
+            new_scope = self._add_variables(var_names, container)
+            body_container = container
         else:  # forall
-            outer_cut = self.eg.add_edge(Hyperedge(edge_type='cut', nodes=[], props={'clif_construct': 'forall'}), container)
-            new_scope = {name: self.eg.add_node(Node(node_type='variable', props={'name': name}), outer_cut).id for name in var_names if name}
-            self.scopes.append(new_scope)
-            inner_cut = self.eg.add_edge(Hyperedge(edge_type='cut', nodes=[]), outer_cut)
-            self._visit(body_sexpr, inner_cut)
-            self.scopes.pop()
-
-    def _visit_atom_predicate(self, name: str, args: List[Tree], container: Optional[Hyperedge]):
+            outer_cut = self.eg.add_cut(container, {'clif_construct': 'forall'})
+            new_scope = self._add_variables(var_names, outer_cut)
+            body_container = self.eg.add_cut(outer_cut)
+        self.scopes = self.scopes.new_child(new_scope)
+        self._work.append((self._pop_scope, None, None))
+        self._work.append((self._visit_sexpr, body_sexpr, body_container))
+
+    def _add_variables(self, var_names: List[Optional[str]], container: Optional[Hyperedge]) -> Dict[str, NodeId]:
+        """Creates the variable nodes bound by a quantifier and returns the new scope."""
+        variables = self.eg.add_nodes([Node(node_type='variable', props={'name': name}) for name in var_names if name], container)
+        return {node.properties['name']: node.id for node in variables}
+
+    def _visit_atom_predicate(self, name: str, args: List[Sexpr], container: Optional[Hyperedge]):
         """Handles a regular atomic predicate with its arguments."""
-        nodes = [self._visit_term(arg, container) for arg in args]
+        # Unary and binary predicates dominate real graphs, so their argument
+        # lists are built directly rather than through a comprehension.
+        visit_term = self._visit_term
+        arity = len(args)
+        if arity == 1:
+            nodes = [visit_term(args[0], container)]
+        elif arity == 2:
+            nodes = [visit_term(args[0], container), visit_term(args[1], container)]
+        else:
+            nodes = [visit_term(arg, container) for arg in args]
         self.eg.add_edge(Hyperedge(edge_type='predicate', nodes=nodes, props={'name': name}), container)
@@ -6,8 +6,9 @@ controller for the application. It manages a library of graphs ("folios")
 and controls the creation and lifecycle of proof sessions ("innings").
 """
 
+import pickle
+from collections import OrderedDict
 from typing import Dict, Optional
-import copy
 
 from eg_hypergraph import EGHg
 from eg_session import EGSession
@@ -18,24 +19,55 @@ class EndoporeuticGame:
     where proofs are constructed. This class is the main entry point for the
     application's backend logic.
     """
-    def __init__(self):
+    def __init__(self, hot_limit: Optional[int] = None):
         """
         Initializes the game controller with an empty folio.
+
+        Args:
+            hot_limit (Optional[int]): How many folio graphs to keep live in
+                memory. Beyond this, the least recently used graphs are kept
+                pickled in `_cold` and revived on demand. None keeps all live.
         """
-        self.folio: Dict[str, EGHg] = {}
+        if hot_limit is not None and hot_limit < 1: raise ValueError("hot_limit must be at least 1.")
+        self.folio: Dict[str, EGHg] = OrderedDict()
+        self._cold: Dict[str, bytes] = {}
+        self.hot_limit = hot_limit
 
     def add_to_folio(self, name: str, graph: EGHg):
         """
         Adds a named graph to the game's folio. This can be used to store
-        domain models, theorems, or interesting starting positions.
+        domain models, theorems, or interesting starting positions. The graph
+        is frozen and stored by reference rather than copied; clone() it first
+        if it still needs to be edited.
 
         Args:
             name (str): The unique name to identify the graph in the folio.
             graph (EGHg): The graph object to store.
         """
-        if name in self.folio:
+        if name in self.folio or name in self._cold:
             raise ValueError(f"A graph with the name '{name}' already exists in the folio.")
-        self.folio[name] = copy.deepcopy(graph)
+        self.folio[name] = graph.freeze()
+        self._evict_cold()
+
+    def _evict_cold(self):
+        """Pickles the least recently used folio graphs beyond the hot limit."""
+        if self.hot_limit is None: return
+        while len(self.folio) > self.hot_limit:
+            name, graph = self.folio.popitem(last=False)
+            self._cold[name] = pickle.dumps(graph, protocol=5)
+
+    def _get_folio_graph(self, name: str) -> EGHg:
+        """Returns a folio graph, reviving it from the cold store if needed."""
+        graph = self.folio.get(name)
+        if graph is not None:
+            self.folio.move_to_end(name)
+            return graph
+        if name not in self._cold:
+            raise ValueError(f"Domain model '{name}' not found in folio.")
+        graph = pickle.loads(self._cold.pop(name))
+        self.folio[name] = graph
+        self._evict_cold()
+        return graph
 
     def start_inning(self, thesis_graph: EGHg, domain_model_name: Optional[str] = None) -> EGSession:
         """
@@ -55,10 +87,8 @@ class EndoporeuticGame:
         """
         domain_model = None
         if domain_model_name:
-            if domain_model_name not in self.folio:
-                raise ValueError(f"Domain model '{domain_model_name}' not found in folio.")
-            # Retrieve a copy of the domain model so the original is not affected.
-            domain_model = copy.deepcopy(self.folio[domain_model_name])
+            # Folio graphs are frozen, so sessions can share them safely.
+            domain_model = self._get_folio_graph(domain_model_name)
         
         # The session is initialized with the thesis and the chosen domain model.
         return EGSession(thesis_graph=thesis_graph, domain_model=domain_model)
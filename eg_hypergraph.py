@@ -6,13 +6,32 @@ as a property hypergraph. This model serves as a robust, central representation
 for translation to and from other logical syntaxes like CLIF and CGIF.
 """
 
-import uuid
-from typing import Dict, Any, List, Optional
+import itertools
+import sys
+from typing import Callable, Collection, Dict, Any, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 
 # --- Type Aliases for Clarity ---
-NodeId = uuid.UUID
-EdgeId = uuid.UUID
+NodeId = int
+EdgeId = int
+ItemId = int  # Either a NodeId or an EdgeId; both share one ID space.
 Properties = Dict[str, Any]
+# A canonical subgraph signature: the sorted (name, node tokens) pairs of its
+# edges, where a token is (0, node_id) for an outside node and (1, name) for
+# one inside the subgraph.
+Signature = Tuple[Tuple[str, Tuple[Tuple[int, Any], ...]], ...]
+
+# IDs are drawn from a single process-wide counter, so they are unique across
+# all graphs and cheap to create, hash and compare.
+_next_id = itertools.count(1).__next__
+
+# Type tags come from a handful of values ('cut', 'predicate', 'variable', ...)
+# and are interned so every instance shares one string object.
+_intern = sys.intern
+
+# Shared node sequence for edges that connect no nodes (cuts), so they do not
+# each allocate an empty list; likewise for nodes that no edge touches.
+_EMPTY_NODES: Tuple[NodeId, ...] = ()
+_NO_EDGES: Tuple[EdgeId, ...] = ()
 
 # --- Core Model Classes ---
 
@@ -21,29 +40,38 @@ class Node:
     Represents a node in the hypergraph. In the context of EGs, a Node can be
     a variable, a constant, or the result of a function.
     """
+    __slots__ = ('id', 'type', 'properties')
+
     def __init__(self, node_type: str, props: Optional[Properties] = None, node_id: Optional[NodeId] = None):
-        self.id: NodeId = node_id or uuid.uuid4()
-        self.type: str = node_type
+        self.id: NodeId = node_id if node_id is not None else _next_id()
+        self.type: str = _intern(node_type)
         self.properties: Properties = props or {}
 
     def __repr__(self) -> str:
-        return f"Node(id={str(self.id)[-4:]}, type='{self.type}', props={self.properties})"
+        return f"Node(id={self.id}, type='{self.type}', props={self.properties})"
 
 class Hyperedge:
     """
     Represents a hyperedge in the hypergraph. In the context of EGs, this can be
     a predicate, a function, or a cut (negation).
     """
-    def __init__(self, edge_type: str, nodes: List[NodeId], props: Optional[Properties] = None, edge_id: Optional[EdgeId] = None):
-        self.id: EdgeId = edge_id or uuid.uuid4()
-        self.type: str = edge_type
-        self.nodes: List[NodeId] = nodes
+    __slots__ = ('id', 'type', 'nodes', 'properties', 'contained_items')
+
+    def __init__(self, edge_type: str, nodes: Sequence[NodeId], props: Optional[Properties] = None, edge_id: Optional[EdgeId] = None):
+        self.id: EdgeId = edge_id if edge_id is not None else _next_id()
+        self.type: str = _intern(edge_type)
+        self.nodes: Sequence[NodeId] = nodes or _EMPTY_NODES
         self.properties: Properties = props or {}
-        self.contained_items: List[uuid.UUID] = []
+        # Ordered set of the items inside this edge (a dict with None values),
+        # so items can be removed without a linear scan.
+        self.contained_items: Dict[ItemId, None] = {}
 
     def __repr__(self) -> str:
-        node_ids_short = [str(n)[-4:] for n in self.nodes]
-        return f"Hyperedge(id={str(self.id)[-4:]}, type='{self.type}', nodes={node_ids_short}, props={self.properties})"
+        return f"Hyperedge(id={self.id}, type='{self.type}', arity={len(self.nodes)})"
+
+    def describe(self) -> str:
+        """Returns a full description of the edge, listing its nodes and properties."""
+        return f"Hyperedge(id={self.id}, type='{self.type}', nodes={list(self.nodes)}, props={self.properties})"
 
 class EGHg:
     """
@@ -52,55 +80,424 @@ class EGHg:
     def __init__(self):
         self.nodes: Dict[NodeId, Node] = {}
         self.edges: Dict[EdgeId, Hyperedge] = {}
-        self.containment: Dict[uuid.UUID, Optional[EdgeId]] = {}
+        self.containment: Dict[ItemId, Optional[EdgeId]] = {}
+        # Ordered items on the Sheet of Assertion, mirroring the
+        # contained_items that each cut keeps for its own context.
+        self.sa_contained_items: Dict[ItemId, None] = {}
+        # Reverse incidence: the edges attached to each node, in the order
+        # they were added. An edge is listed once even if it uses a node twice.
+        self.node_to_edges: Dict[NodeId, List[EdgeId]] = {}
+        # Context depths computed so far. Adding items never changes an
+        # existing depth, so only moves (for the moved subtree) and removals
+        # touch this cache.
+        self._depth_cache: Dict[ItemId, int] = {}
+        # Enclosing cuts of each item, kept under the same rules as depths.
+        self._ancestor_cache: Dict[ItemId, FrozenSet[EdgeId]] = {}
+        # Deepest context depth in the graph, or None until max_depth() is
+        # asked again after an item is added to a cut, moved or removed.
+        self._max_depth: Optional[int] = None
+        # Canonical signatures of single items, kept for the transformations.
+        # They depend only on the item's own fields, which forks share and
+        # must not edit, so a fork starts from a copy; a clone may have its
+        # properties edited and starts empty. Removed items are dropped.
+        self._signature_cache: Dict[ItemId, Signature] = {}
+        # Signatures of the edges directly inside each context, built on
+        # demand and dropped whenever that context's items change.
+        self._context_signatures: Dict[Optional[EdgeId], FrozenSet[Signature]] = {}
+        # After fork(), Hyperedge objects and incidence lists are shared with
+        # the other graph. This holds the IDs of the edges (and of the nodes'
+        # incidence lists) that this graph has since copied and may modify in
+        # place. None means nothing is shared.
+        self._owned: Optional[Set[ItemId]] = None
+        self.frozen: bool = False
+
+    def freeze(self) -> 'EGHg':
+        """
+        Marks the graph read-only so it can be shared by reference (e.g. in a
+        folio). Mutators raise afterwards; copies made by clone() or fork() are
+        mutable.
+        """
+        self.frozen = True
+        return self
+
+    def _check_mutable(self):
+        if self.frozen: raise ValueError("Cannot modify a frozen graph; clone() it first.")
+
+    def _writable_edge(self, edge_id: EdgeId) -> Hyperedge:
+        """
+        Returns a container edge that this graph may modify, first copying it
+        if it is still shared with a fork.
+        """
+        edge = self.edges.get(edge_id)
+        if edge is None: raise ValueError(f"Container edge {edge_id} does not exist.")
+        owned = self._owned
+        if owned is not None and edge_id not in owned:
+            copied = Hyperedge.__new__(Hyperedge)
+            copied.id, copied.type, copied.nodes, copied.properties = edge_id, edge.type, edge.nodes, edge.properties
+            copied.contained_items = dict(edge.contained_items)
+            edge = self.edges[edge_id] = copied
+            owned.add(edge_id)
+        return edge
+
+    def _incidence_for(self, node_id: NodeId) -> List[EdgeId]:
+        """Returns a node's incidence list for modification, creating or unsharing it."""
+        owned = self._owned
+        edge_ids = self.node_to_edges.get(node_id)
+        if edge_ids is None:
+            edge_ids = self.node_to_edges[node_id] = []
+        elif owned is not None and node_id not in owned:
+            edge_ids = self.node_to_edges[node_id] = list(edge_ids)
+        else:
+            return edge_ids
+        if owned is not None: owned.add(node_id)
+        return edge_ids
+
+    def _context_items_for(self, container: Optional[Hyperedge]) -> Tuple[Optional[EdgeId], Dict[ItemId, None]]:
+        """
+        Resolves the container an item is being added to with a single edge
+        lookup, returning its ID and the item set that receives the new ID.
+        The caller modifies that set, so the context's signature index is
+        dropped here.
+        """
+        if container is None:
+            self._context_signatures.pop(None, None)
+            return None, self.sa_contained_items
+        self._context_signatures.pop(container.id, None)
+        return container.id, self._writable_edge(container.id).contained_items
 
     def add_node(self, node: Node, container: Optional[Hyperedge] = None) -> Node:
         """Adds a node to the graph and registers its container."""
+        self._check_mutable()
         if node.id in self.nodes: raise ValueError(f"Node with ID {node.id} already exists.")
+        container_id, context_items = self._context_items_for(container)
         self.nodes[node.id] = node
-        container_id = container.id if container else None
-        if container_id:
-            if container_id not in self.edges: raise ValueError(f"Container edge {container_id} does not exist.")
-            self.edges[container_id].contained_items.append(node.id)
+        context_items[node.id] = None
+        if container_id is not None: self._max_depth = None
         self.containment[node.id] = container_id
         return node
 
+    def add_nodes(self, nodes: Iterable[Node], container: Optional[Hyperedge] = None) -> List[Node]:
+        """
+        Adds several nodes to the same container in a single pass. All checks
+        are made before the graph is touched, so a failed call changes nothing.
+        """
+        self._check_mutable()
+        nodes = list(nodes)
+        new_nodes = {node.id: node for node in nodes}
+        if len(new_nodes) != len(nodes): raise ValueError("Duplicate node IDs in batch.")
+        existing = new_nodes.keys() & self.nodes.keys()
+        if existing: raise ValueError(f"Nodes with IDs {existing} already exist.")
+        container_id, context_items = self._context_items_for(container)
+        context_items.update(dict.fromkeys(new_nodes))
+        if container_id is not None: self._max_depth = None
+        self.nodes.update(new_nodes)
+        self.containment.update(dict.fromkeys(new_nodes, container_id))
+        return nodes
+
     def add_edge(self, edge: Hyperedge, container: Optional[Hyperedge] = None) -> Hyperedge:
         """Adds a hyperedge to the graph and registers its container."""
+        self._check_mutable()
         if edge.id in self.edges: raise ValueError(f"Edge with ID {edge.id} already exists.")
-        for node_id in edge.nodes:
-            if node_id not in self.nodes: raise ValueError(f"Edge connects to non-existent node {node_id}.")
+        # set.difference against a dict probes only the edge's own node IDs.
+        missing = set(edge.nodes).difference(self.nodes)
+        if missing: raise ValueError(f"Edge connects to non-existent nodes {missing}.")
+        return self._add_edge_unchecked(edge, container)
+
+    def _add_edge_unchecked(self, edge: Hyperedge, container: Optional[Hyperedge] = None) -> Hyperedge:
+        """
+        Adds a hyperedge the caller has just created, skipping the duplicate-ID
+        and node-existence checks. The container is still checked.
+        """
+        self._check_mutable()
+        container_id, context_items = self._context_items_for(container)
         self.edges[edge.id] = edge
-        container_id = container.id if container else None
-        if container_id:
-            if container_id not in self.edges: raise ValueError(f"Container edge {container_id} does not exist.")
-            self.edges[container_id].contained_items.append(edge.id)
+        if self._owned is not None: self._owned.add(edge.id)
+        for node_id in dict.fromkeys(edge.nodes):
+            self._incidence_for(node_id).append(edge.id)
+        context_items[edge.id] = None
+        if container_id is not None: self._max_depth = None
         self.containment[edge.id] = container_id
         return edge
 
-    def get_items_in_context(self, container_id: Optional[EdgeId]) -> List[uuid.UUID]:
+    def add_edges(self, edges: Iterable[Hyperedge], container: Optional[Hyperedge] = None) -> List[Hyperedge]:
         """
-        Returns an ordered list of all item IDs within a given context.
+        Adds several hyperedges to the same container in a single pass. As with
+        add_nodes, every check is made before the graph is touched.
         """
-        if container_id:
-            if container_id not in self.edges: raise ValueError(f"Container edge {container_id} does not exist.")
-            return self.edges[container_id].contained_items
+        self._check_mutable()
+        edges = list(edges)
+        new_edges = {edge.id: edge for edge in edges}
+        if len(new_edges) != len(edges): raise ValueError("Duplicate edge IDs in batch.")
+        existing = new_edges.keys() & self.edges.keys()
+        if existing: raise ValueError(f"Edges with IDs {existing} already exist.")
+        missing = set().union(*(edge.nodes for edge in edges)).difference(self.nodes)
+        if missing: raise ValueError(f"Edges connect to non-existent nodes {missing}.")
+        container_id, context_items = self._context_items_for(container)
+        self.edges.update(new_edges)
+        if self._owned is not None: self._owned.update(new_edges)
+        for edge in edges:
+            for node_id in dict.fromkeys(edge.nodes):
+                self._incidence_for(node_id).append(edge.id)
+        context_items.update(dict.fromkeys(new_edges))
+        if container_id is not None: self._max_depth = None
+        self.containment.update(dict.fromkeys(new_edges, container_id))
+        return edges
+
+    def add_cut(self, container: Optional[Hyperedge] = None, props: Optional[Properties] = None) -> Hyperedge:
+        """Adds an empty cut to the given container and returns it."""
+        # A new cut has a fresh ID and no nodes, so there is nothing to check.
+        return self._add_edge_unchecked(Hyperedge(edge_type='cut', nodes=_EMPTY_NODES, props=props), container)
+
+    def _contained_items_of(self, container_id: Optional[EdgeId]) -> Dict[ItemId, None]:
+        """
+        Returns the live, modifiable item set of a context (a cut or the SA),
+        dropping the context's signature index as the caller will change it.
+        """
+        self._context_signatures.pop(container_id, None)
+        return self._writable_edge(container_id).contained_items if container_id is not None else self.sa_contained_items
+
+    def move_item(self, item_id: ItemId, container_id: Optional[EdgeId]):
+        """
+        Moves an item, together with everything inside it, to the end of
+        another context (a cut, or the SA when container_id is None).
+        """
+        self._check_mutable()
+        if item_id not in self.containment: raise ValueError(f"Item {item_id} not found in graph.")
+        if container_id is not None and container_id not in self.edges: raise ValueError(f"Container edge {container_id} does not exist.")
+        if container_id is not None and (container_id == item_id or item_id in self.ancestors(container_id)):
+            raise ValueError(f"Cannot move item {item_id} into itself or its own contents.")
+        del self._contained_items_of(self.containment[item_id])[item_id]
+        self._contained_items_of(container_id)[item_id] = None
+        self.containment[item_id] = container_id
+        self._forget_depths(item_id)
+        self._max_depth = None
+
+    def move_items(self, item_ids: Iterable[ItemId], container_id: Optional[EdgeId]):
+        """
+        Moves several items, in order, to the end of another context, as
+        move_item does for one. The target context and containment are
+        updated with one bulk operation each. A repeated ID is moved once.
+        """
+        self._check_mutable()
+        item_ids = list(dict.fromkeys(item_ids))
+        containment = self.containment
+        missing = set(item_ids).difference(containment)
+        if missing: raise ValueError(f"Items {missing} not found in graph.")
+        if container_id is not None and container_id not in self.edges: raise ValueError(f"Container edge {container_id} does not exist.")
+        if container_id is not None:
+            cycle = self.ancestors(container_id).union((container_id,)).intersection(item_ids)
+            if cycle: raise ValueError(f"Cannot move items {cycle} into themselves or their own contents.")
+        # Moved items usually share one source context; look it up once.
+        source_id, source_items = None, None
+        for item_id in item_ids:
+            if source_items is None or containment[item_id] != source_id:
+                source_id = containment[item_id]
+                source_items = self._contained_items_of(source_id)
+            del source_items[item_id]
+        self._contained_items_of(container_id).update(dict.fromkeys(item_ids))
+        containment.update(dict.fromkeys(item_ids, container_id))
+        for item_id in item_ids:
+            self._forget_depths(item_id)
+        self._max_depth = None
+
+    def _forget_depths(self, item_id: ItemId):
+        """
+        Drops the cached depth and ancestor set of an item and of everything
+        inside it. Both caches always hold an item's containers along with the
+        item, so an uncached item has no cached descendants to visit.
+        """
+        depth_cache, ancestor_cache = self._depth_cache, self._ancestor_cache
+        if item_id not in depth_cache and item_id not in ancestor_cache: return
+        edges = self.edges
+        stack = [item_id]
+        while stack:
+            current = stack.pop()
+            depth_cache.pop(current, None)
+            ancestor_cache.pop(current, None)
+            edge = edges.get(current)
+            if edge is not None: stack.extend(edge.contained_items)
+
+    def remove_item(self, item_id: ItemId):
+        """
+        Removes a node, or an edge that contains nothing, from the graph and
+        from its context.
+        """
+        self._check_mutable()
+        if item_id not in self.containment: raise ValueError(f"Item {item_id} not found in graph.")
+        edge = self.edges.get(item_id)
+        if edge is not None and edge.contained_items: raise ValueError(f"Edge {item_id} still contains items.")
+        del self._contained_items_of(self.containment.pop(item_id))[item_id]
+        self._depth_cache.pop(item_id, None)
+        self._ancestor_cache.pop(item_id, None)
+        self._signature_cache.pop(item_id, None)
+        self._max_depth = None
+        if self._owned is not None: self._owned.discard(item_id)
+        if edge is not None:
+            del self.edges[item_id]
+            self._context_signatures.pop(item_id, None)
+            for node_id in dict.fromkeys(edge.nodes):
+                # The node may already be gone when a subgraph is erased node-first.
+                if node_id in self.node_to_edges: self._incidence_for(node_id).remove(item_id)
         else:
-            return [item_id for item_id, c_id in self.containment.items() if c_id is None]
+            del self.nodes[item_id]
+            self.node_to_edges.pop(item_id, None)
+
+    def remove_items(self, item_ids: Iterable[ItemId]):
+        """
+        Removes items together with everything nested inside them, in one
+        pass. Only the contexts of the given items are edited; the contents
+        of removed cuts are dropped with the cuts rather than one by one.
+        """
+        self._check_mutable()
+        item_ids = list(item_ids)
+        containment, edges, nodes = self.containment, self.edges, self.nodes
+        missing = set(item_ids).difference(containment)
+        if missing: raise ValueError(f"Items {missing} not found in graph.")
+        victims: Dict[ItemId, None] = {}
+        stack = item_ids[::-1]
+        while stack:
+            item_id = stack.pop()
+            if item_id in victims: continue
+            victims[item_id] = None
+            edge = edges.get(item_id)
+            if edge is not None: stack.extend(edge.contained_items)
+        for item_id in item_ids:
+            container_id = containment[item_id]
+            if container_id not in victims:
+                self._contained_items_of(container_id).pop(item_id, None)
+        depth_cache, ancestor_cache, signatures = self._depth_cache, self._ancestor_cache, self._context_signatures
+        signature_cache = self._signature_cache
+        for item_id in victims:
+            del containment[item_id]
+            depth_cache.pop(item_id, None)
+            ancestor_cache.pop(item_id, None)
+            signature_cache.pop(item_id, None)
+            edge = edges.pop(item_id, None)
+            if edge is None:
+                del nodes[item_id]
+                self.node_to_edges.pop(item_id, None)
+                continue
+            signatures.pop(item_id, None)
+            for node_id in dict.fromkeys(edge.nodes):
+                if node_id not in victims and node_id in self.node_to_edges:
+                    self._incidence_for(node_id).remove(item_id)
+        if self._owned is not None: self._owned.difference_update(victims)
+        self._max_depth = None
+
+    def iter_items_in_context(self, container_id: Optional[EdgeId]) -> Collection[ItemId]:
+        """
+        Returns the ordered item IDs of a context without copying them. The
+        result is the graph's own item set: iterate it or test membership,
+        but do not modify it or hold on to it across mutations.
+        """
+        if container_id:
+            container_edge = self.edges.get(container_id)
+            if container_edge is None: raise ValueError(f"Container edge {container_id} does not exist.")
+            return container_edge.contained_items
+        return self.sa_contained_items
+
+    def get_items_in_context(self, container_id: Optional[EdgeId]) -> List[ItemId]:
+        """
+        Returns an ordered list of all item IDs within a given context.
+        """
+        return list(self.iter_items_in_context(container_id))
+
+    def edges_on_node(self, node_id: NodeId) -> Sequence[EdgeId]:
+        """Returns the IDs of the edges attached to a node, without scanning all edges."""
+        return self.node_to_edges.get(node_id, _NO_EDGES)
+
+    def item_signature(self, item_id: ItemId, build: Callable[[ItemId], Signature]) -> Signature:
+        """
+        Returns the canonical signature of a single item, calling build for it
+        only the first time. Entries are dropped when the item is removed.
+        """
+        cache = self._signature_cache
+        signature = cache.get(item_id)
+        if signature is None:
+            signature = cache[item_id] = build(item_id)
+        return signature
+
+    def context_signatures(self, container_id: Optional[EdgeId], build: Callable[[ItemId], Signature]) -> FrozenSet[Signature]:
+        """
+        Returns the signatures of the edges directly inside a context, as
+        item_signature gives them. The set is kept until the context changes.
+        """
+        index = self._context_signatures
+        signatures = index.get(container_id)
+        if signatures is None:
+            edges = self.edges
+            signatures = index[container_id] = frozenset(
+                self.item_signature(item_id, build)
+                for item_id in self.iter_items_in_context(container_id) if item_id in edges
+            )
+        return signatures
 
-    def get_context_depth(self, item_id: uuid.UUID) -> int:
+    def get_context_depth(self, item_id: ItemId) -> int:
         """
         Calculates the nesting depth of an item (how many cuts it is inside).
+        Depths are cached; a miss walks up only to the nearest cached ancestor
+        and then fills in the depth of every container on the way.
         """
+        cache = self._depth_cache
+        depth = cache.get(item_id)
+        if depth is not None: return depth
         if item_id not in self.containment:
             raise ValueError(f"Item {item_id} not found in graph.")
-        depth = 0
         current_container_id = self.containment[item_id]
+        if current_container_id is None: return 0 # On the SA
+        path = [item_id]
+        base = 0
         while current_container_id is not None:
-            depth += 1
+            known = cache.get(current_container_id)
+            if known is not None:
+                base = known + 1
+                break
+            path.append(current_container_id)
             current_container_id = self.containment.get(current_container_id)
+        for depth, path_id in enumerate(reversed(path), start=base):
+            cache[path_id] = depth
         return depth
 
+    def max_depth(self) -> int:
+        """
+        Returns the depth of the most deeply nested item (0 for a graph with
+        no cuts), for use as a bound by callers that scan every depth.
+        """
+        if self._max_depth is None:
+            self._max_depth = max(map(self.get_context_depth, self.containment), default=0)
+        return self._max_depth
+
+    def ancestors(self, item_id: ItemId) -> FrozenSet[EdgeId]:
+        """
+        Returns the IDs of all cuts enclosing an item. Results are cached and
+        built on the cached set of the nearest enclosing cut.
+        """
+        cache = self._ancestor_cache
+        result = cache.get(item_id)
+        if result is not None: return result
+        if item_id not in self.containment:
+            raise ValueError(f"Item {item_id} not found in graph.")
+        path = [item_id]
+        result = frozenset()
+        current_container_id = self.containment[item_id]
+        while current_container_id is not None:
+            known = cache.get(current_container_id)
+            if known is not None:
+                result = known | {current_container_id}
+                break
+            path.append(current_container_id)
+            current_container_id = self.containment.get(current_container_id)
+        # Walk back down from the outermost uncached item, extending the set.
+        cache[path[-1]] = result
+        for child_id, parent_id in zip(reversed(path[:-1]), reversed(path)):
+            result = result | {parent_id}
+            cache[child_id] = result
+        return result
+
+    def is_in_scope(self, item_id: ItemId, cut_id: Optional[EdgeId]) -> bool:
+        """Checks whether an item lies (at any depth) inside the given cut or the SA."""
+        return cut_id is None or cut_id in self.ancestors(item_id)
+
     def is_ancestor(self, ancestor_id: Optional[EdgeId], descendant_id: Optional[EdgeId]) -> bool:
         """
         Checks if one container is an ancestor of another (i.e., is shallower
@@ -111,15 +508,117 @@ class EGHg:
             return True # A context is an ancestor of itself for iteration purposes
         if ancestor_id is None:
             return True # The SA is an ancestor of everything
-        if descendant_id is None:
+        if descendant_id is None or descendant_id not in self.containment:
             return False # Nothing can be an ancestor of the SA
+        return ancestor_id in self.ancestors(descendant_id)
+
+    def clone(self) -> 'EGHg':
+        """
+        Returns an independent, mutable copy of the graph, keeping all IDs.
+        This is much cheaper than copy.deepcopy because it knows the structure
+        it copies: objects are rebuilt without going through __init__, and an
+        edge's node sequence, which is never modified in place, is shared.
+        Property dicts are copied one level deep, so their values must be
+        immutable (names, construct hints, ...).
+        """
+        new_hg = EGHg()
+        new_nodes = new_hg.nodes
+        for node_id, node in self.nodes.items():
+            new_node = Node.__new__(Node)
+            new_node.id, new_node.type, new_node.properties = node_id, node.type, dict(node.properties)
+            new_nodes[node_id] = new_node
+        new_edges = new_hg.edges
+        for edge_id, edge in self.edges.items():
+            new_edge = Hyperedge.__new__(Hyperedge)
+            new_edge.id, new_edge.type, new_edge.nodes = edge_id, edge.type, edge.nodes
+            new_edge.properties = dict(edge.properties)
+            new_edge.contained_items = dict(edge.contained_items)
+            new_edges[edge_id] = new_edge
+        new_hg.node_to_edges = {node_id: list(edge_ids) for node_id, edge_ids in self.node_to_edges.items()}
+        new_hg.containment = dict(self.containment)
+        new_hg.sa_contained_items = dict(self.sa_contained_items)
+        new_hg._depth_cache = dict(self._depth_cache)
+        new_hg._ancestor_cache = dict(self._ancestor_cache)
+        new_hg._max_depth = self._max_depth
+        return new_hg
+
+    def fork(self) -> 'EGHg':
+        """
+        Returns a mutable copy that shares its Node and Hyperedge objects with
+        this graph. Only the top-level maps are copied; a shared edge or
+        incidence list is copied by whichever graph first modifies it. This is
+        much cheaper than clone() when the copy changes only a few contexts,
+        as a transformation does. Shared objects must not be edited directly.
+        """
+        new_hg = EGHg()
+        new_hg.nodes = dict(self.nodes)
+        new_hg.edges = dict(self.edges)
+        new_hg.containment = dict(self.containment)
+        new_hg.sa_contained_items = dict(self.sa_contained_items)
+        new_hg.node_to_edges = dict(self.node_to_edges)
+        new_hg._depth_cache = dict(self._depth_cache)
+        new_hg._ancestor_cache = dict(self._ancestor_cache)
+        new_hg._max_depth = self._max_depth
+        new_hg._signature_cache = dict(self._signature_cache)
+        new_hg._context_signatures = dict(self._context_signatures)
+        # From now on both graphs share everything they had.
+        self._owned = set()
+        new_hg._owned = set()
+        return new_hg
 
-        current = self.containment.get(descendant_id)
-        while current is not None:
-            if current == ancestor_id:
-                return True
-            current = self.containment.get(current)
-        return False
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'EGHg':
+        return self.clone()
 
     def __repr__(self) -> str:
         return f"EGHg(nodes={len(self.nodes)}, edges={len(self.edges)})"
+
+class EGHgBuilder:
+    """
+    Collects nodes and hyperedges for a new graph and builds the EGHg and all
+    of its indexes in one pass at the end, instead of updating them on every
+    insert. Items keep the order in which they were added.
+    """
+    def __init__(self):
+        self._items: List[Tuple[Any, Optional[EdgeId]]] = []
+
+    def add_node(self, node: Node, container: Optional[Hyperedge] = None) -> Node:
+        """Records a node to be placed in the given container (or the SA)."""
+        self._items.append((node, container.id if container else None))
+        return node
+
+    def add_edge(self, edge: Hyperedge, container: Optional[Hyperedge] = None) -> Hyperedge:
+        """Records a hyperedge to be placed in the given container (or the SA)."""
+        self._items.append((edge, container.id if container else None))
+        return edge
+
+    def build(self, freeze: bool = False) -> EGHg:
+        """
+        Materializes the recorded items into a new graph, checking the same
+        rules as EGHg.add_node/add_edge. Optionally returns it frozen.
+        """
+        hg = EGHg()
+        nodes, edges, containment = hg.nodes, hg.edges, hg.containment
+        # Items are checked in the order they were recorded, as add_node and
+        # add_edge would check them: containers and nodes must come first.
+        # Nothing is written to the recorded objects until all items pass.
+        for item, container_id in self._items:
+            if item.id in containment: raise ValueError(f"Duplicate item ID {item.id} in builder.")
+            if container_id is not None and container_id not in edges:
+                raise ValueError(f"Container edge {container_id} does not exist.")
+            if isinstance(item, Hyperedge):
+                missing = set(item.nodes).difference(nodes)
+                if missing: raise ValueError(f"Edge connects to non-existent nodes {missing}.")
+                if item.contained_items: raise ValueError(f"Edge {item.id} already contains items.")
+                edges[item.id] = item
+            else:
+                nodes[item.id] = item
+            containment[item.id] = container_id
+        node_to_edges = hg.node_to_edges
+        for edge in edges.values():
+            for node_id in dict.fromkeys(edge.nodes):
+                node_to_edges.setdefault(node_id, []).append(edge.id)
+        sa_items = hg.sa_contained_items
+        for item_id, container_id in containment.items():
+            if container_id is None: sa_items[item_id] = None
+            else: edges[container_id].contained_items[item_id] = None
+        return hg.freeze() if freeze else hg
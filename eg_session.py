@@ -7,10 +7,9 @@ Endoporeutic Game.
 """
 
 from typing import List, Any, Optional, Dict
-import copy
 from enum import Enum
 
-from eg_hypergraph import EGHg, EdgeId, Hyperedge, Node
+from eg_hypergraph import EGHg, EdgeId, Node
 from eg_transformations import EGTransformation
 
 class Player(Enum):
@@ -25,12 +24,17 @@ class GameStatus(Enum):
     SKEPTIC_WIN = 3
     DRAW_EXTEND = 4 # For when a thesis is consistent but not provable
 
+# The other player, and the status reached when the current player's
+# contested context is emptied.
+_NEXT_PLAYER = {Player.PROPOSER: Player.SKEPTIC, Player.SKEPTIC: Player.PROPOSER}
+_WIN_STATUS = {Player.PROPOSER: GameStatus.PROPOSER_WIN, Player.SKEPTIC: GameStatus.SKEPTIC_WIN}
+
 class EGSession:
     """
     Manages a sequence of transformations on an Existential Graph, maintaining
     a history of states and the logic for the Endoporeutic Game.
     """
-    def __init__(self, thesis_graph: EGHg, domain_model: Optional[EGHg] = None):
+    def __init__(self, thesis_graph: EGHg, domain_model: Optional[EGHg] = None, history_limit: Optional[int] = None):
         """
         Initializes a new session (inning).
 
@@ -38,20 +42,28 @@ class EGSession:
             thesis_graph (EGHg): The graph representing the thesis of the proof.
             domain_model (Optional[EGHg]): The model against which the thesis
                 is evaluated. If None, an empty model is used.
+            history_limit (Optional[int]): The most graph states to keep for
+                undo. Older states are dropped once it is reached. None keeps
+                the whole history.
         """
+        if history_limit is not None and history_limit < 1: raise ValueError("history_limit must be at least 1.")
+        self.history_limit = history_limit
         self.domain_model = domain_model or EGHg()
         
         # The game starts by placing the thesis inside a negation on the SA
         # This represents the Proposer's goal: to show that (not thesis) is a contradiction.
-        initial_graph = EGHg()
-        negation_cut = initial_graph.add_edge(Hyperedge(edge_type='cut', nodes=[]))
-        
-        # Use the transformation's copy logic to place the thesis inside the cut
-        copier = EGTransformation(initial_graph)
-        copier._copy_recursive(source_graph=thesis_graph, source_container_id=None, target_container=negation_cut)
+        # The thesis is forked rather than copied: its items keep their IDs and
+        # stay shared with the caller's graph until either side changes them.
+        initial_graph = thesis_graph.fork()
+        thesis_items = list(initial_graph.iter_items_in_context(None))
+        negation_cut = initial_graph.add_cut()
+        initial_graph.move_items(thesis_items, negation_cut.id)
 
         self._history: List[EGHg] = [initial_graph]
         self._history_index = 0
+        # One controller serves every move; it is pointed at the current
+        # graph before each use (all its state lives in the graph itself).
+        self._transformer = EGTransformation(initial_graph)
         
         self.player: Player = Player.PROPOSER
         self.status: GameStatus = GameStatus.IN_PROGRESS
@@ -68,21 +80,32 @@ class EGSession:
         Applies a transformation rule to the current graph state and records
         the new state in the history. Returns True if successful.
         """
-        transformer = EGTransformation(self.current_graph)
+        transformer = self._transformer
+        transformer.hg = self.current_graph
         transform_method = getattr(transformer, rule_name, None)
         if not callable(transform_method):
             raise AttributeError(f"'{rule_name}' is not a valid transformation rule.")
 
         try:
             new_graph = transform_method(**kwargs)
-            self._history_index += 1
-            self._history = self._history[:self._history_index]
-            self._history.append(new_graph)
+            self._push_history(new_graph)
             return True
         except ValueError as e:
             print(f"Transformation failed: {e}")
             return False
 
+    def _push_history(self, new_graph: EGHg):
+        """
+        Records a new current state, discarding any redo states after the
+        current one and, past the history limit, the oldest state.
+        """
+        self._history_index += 1
+        del self._history[self._history_index:]
+        self._history.append(new_graph)
+        if self.history_limit is not None and len(self._history) > self.history_limit:
+            del self._history[0]
+            self._history_index -= 1
+
     def get_legal_moves(self) -> List[Dict[str, Any]]:
         """
         Determines the set of legal moves for the current player based on the
@@ -115,29 +138,18 @@ class EGSession:
         if self.contested_context is None:
             raise ValueError("Cannot remove negation from the Sheet of Assertion.")
         
-        new_hg = copy.deepcopy(self.current_graph)
+        new_hg = self.current_graph.fork()
         
         cut_to_remove = new_hg.edges[self.contested_context]
         parent_container_id = new_hg.containment[self.contested_context]
-        parent_container = new_hg.edges.get(parent_container_id) if parent_container_id else None
 
         items_to_promote = list(cut_to_remove.contained_items)
-        if parent_container:
-            parent_container.contained_items.remove(self.contested_context)
-        
-        for item_id in items_to_promote:
-            new_hg.containment[item_id] = parent_container_id
-            if parent_container:
-                parent_container.contained_items.append(item_id)
-        
-        del new_hg.containment[self.contested_context]
-        del new_hg.edges[self.contested_context]
+        new_hg.move_items(items_to_promote, parent_container_id)
+        new_hg.remove_item(self.contested_context)
 
-        self._history_index += 1
-        self._history = self._history[:self._history_index]
-        self._history.append(new_hg)
+        self._push_history(new_hg)
 
-        self.player = Player.SKEPTIC if self.player == Player.PROPOSER else Player.PROPOSER
+        self.player = _NEXT_PLAYER[self.player]
         # A simplification: assumes the new context is the first promoted item if it's a cut.
         self.contested_context = items_to_promote[0] if items_to_promote and items_to_promote[0] in new_hg.edges else None
         
@@ -145,11 +157,8 @@ class EGSession:
 
     def check_for_win_loss(self):
         """Checks the current graph for win/loss conditions."""
-        if not self.current_graph.get_items_in_context(self.contested_context):
-            if self.player == Player.PROPOSER:
-                self.status = GameStatus.PROPOSER_WIN
-            else:
-                self.status = GameStatus.SKEPTIC_WIN
+        if not self.current_graph.iter_items_in_context(self.contested_context):
+            self.status = _WIN_STATUS[self.player]
         
         # A full implementation would also check for the semantic mapping step.
 
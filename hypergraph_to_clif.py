@@ -6,15 +6,18 @@ as a Hypergraph) model back into a CLIF (Common Logic Interchange Format) string
 This version preserves order and reconstructs forall/if/or statements.
 """
 
-import uuid
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Generator, List, Optional
 
-from eg_hypergraph import EGHg, Node, Hyperedge, NodeId
+from eg_hypergraph import EGHg, Node, Hyperedge, NodeId, ItemId
+
+# A translation step: a generator that yields the steps whose strings it
+# needs and returns its own string.
+Step = Generator['Step', str, str]
 
 class HypergraphToClif:
     """
-    Translates an EGHg model object into a CLIF string by recursively
-    visiting the graph's contexts and reconstructing the syntax.
+    Translates an EGHg model object into a CLIF string by visiting the
+    graph's contexts and reconstructing the syntax.
     """
     def __init__(self, hg: EGHg):
         """
@@ -29,7 +32,28 @@ class HypergraphToClif:
 
     def translate(self) -> str:
         """The main public method to perform the translation."""
-        return self._visit_context(None)
+        return self._run(self._visit_context(None))
+
+    @staticmethod
+    def _run(step: Step) -> str:
+        """
+        Drives translation steps with an explicit stack instead of recursion,
+        so deeply nested cuts do not grow the Python call stack. A step that
+        yields another step is resumed with that step's string once it is done,
+        so the output and the order in which nodes are named are unchanged.
+        """
+        stack = [step]
+        result = None
+        while stack:
+            try:
+                sub_step = stack[-1].send(result)
+            except StopIteration as done:
+                stack.pop()
+                result = done.value
+                continue
+            stack.append(sub_step)
+            result = None
+        return result
 
     def _get_node_name(self, node_id: NodeId) -> str:
         """
@@ -50,8 +74,11 @@ class HypergraphToClif:
         """
         node = self.hg.nodes[node_id]
         if 'source_function' in node.properties:
-            # Reconstruct the functional term, e.g., (FatherOf Cain)
-            for edge in self.hg.edges.values():
+            # Reconstruct the functional term, e.g., (FatherOf Cain). Only the
+            # edges attached to the node can produce it.
+            edges = self.hg.edges
+            for edge_id in self.hg.edges_on_node(node_id):
+                edge = edges[edge_id]
                 if edge.type == 'function' and node_id == edge.nodes[0]:
                     function_name = edge.properties['name']
                     arg_nodes = edge.nodes[1:]
@@ -59,12 +86,12 @@ class HypergraphToClif:
                     return f"({function_name} {' '.join(arg_strings)})"
         return self._get_node_name(node_id)
 
-    def _visit_context(self, container_id: Optional[NodeId]) -> str:
+    def _visit_context(self, container_id: Optional[NodeId]) -> Step:
         """
         Translates all items within a given context (the SA or a cut) into a
         single CLIF string.
         """
-        items_in_context = self.hg.get_items_in_context(container_id)
+        items_in_context = self.hg.iter_items_in_context(container_id)
         
         # Find all variables that are existentially quantified in this context.
         quantified_vars = [
@@ -80,8 +107,10 @@ class HypergraphToClif:
             if isinstance(self.hg.edges.get(item_id), Hyperedge)
         ]
         
-        clif_parts = [self._visit_item(item_id) for item_id in content_items]
-        clif_parts = [part for part in clif_parts if part]
+        clif_parts = []
+        for item_id in content_items:
+            part = yield self._visit_item(item_id)
+            if part: clif_parts.append(part)
 
         # Combine multiple parts with (and ...).
         body = ""
@@ -95,7 +124,7 @@ class HypergraphToClif:
             return f"(exists ({' '.join(quantified_vars)}) {body})"
         return body
 
-    def _visit_item(self, item_id: uuid.UUID) -> str:
+    def _visit_item(self, item_id: ItemId) -> Step:
         """
         Translates a single hyperedge item into its CLIF string representation,
         dispatching to reconstruction helpers if necessary.
@@ -105,11 +134,11 @@ class HypergraphToClif:
 
         if edge.type == 'cut':
             # Check for hints to reconstruct higher-level syntax.
-            if construct == 'forall': return self._reconstruct_forall(edge)
-            if construct == 'if': return self._reconstruct_if(edge)
-            if construct == 'or': return self._reconstruct_or(edge)
+            if construct == 'forall': return (yield self._reconstruct_forall(edge))
+            if construct == 'if': return (yield self._reconstruct_if(edge))
+            if construct == 'or': return (yield self._reconstruct_or(edge))
             # Default case: simple negation.
-            inner_content = self._visit_context(edge.id)
+            inner_content = yield self._visit_context(edge.id)
             return f"(not {inner_content})"
         
         if edge.type == 'predicate':
@@ -121,9 +150,9 @@ class HypergraphToClif:
         if edge.type == 'function': return "" # Handled by _node_to_clif
         return f"<!-- Unknown edge type: {edge.type} -->"
 
-    def _reconstruct_forall(self, edge: Hyperedge) -> str:
+    def _reconstruct_forall(self, edge: Hyperedge) -> Step:
         """Reconstructs a (forall ...) statement from its (not (exists ...)) form."""
-        items_in_outer_cut = self.hg.get_items_in_context(edge.id)
+        items_in_outer_cut = self.hg.iter_items_in_context(edge.id)
         quantified_vars = [
             self._get_node_name(item_id) for item_id in items_in_outer_cut
             if isinstance(self.hg.nodes.get(item_id), Node) and self.hg.nodes[item_id].type == 'variable'
@@ -132,12 +161,12 @@ class HypergraphToClif:
         if not inner_cut_ids: raise ValueError("Malformed 'forall' structure.")
         
         # The body of the forall is the content of the inner 'not'
-        body = self._visit_context(inner_cut_ids[0])
+        body = yield self._visit_context(inner_cut_ids[0])
         return f"(forall ({' '.join(quantified_vars)}) {body})"
 
-    def _reconstruct_if(self, edge: Hyperedge) -> str:
+    def _reconstruct_if(self, edge: Hyperedge) -> Step:
         """Reconstructs an (if P Q) statement from its (not (and P (not Q))) form."""
-        items_in_context = self.hg.get_items_in_context(edge.id)
+        items_in_context = self.hg.iter_items_in_context(edge.id)
         inner_cut_id = None
         p_item_ids = []
 
@@ -151,25 +180,28 @@ class HypergraphToClif:
         if inner_cut_id is None: raise ValueError("Malformed 'if' structure.")
         
         # The consequent Q is the content of the inner cut.
-        q_part = self._visit_context(inner_cut_id)
+        q_part = yield self._visit_context(inner_cut_id)
         
         # The antecedent P is everything else in the outer cut.
-        p_clif_parts = [self._visit_item(item_id) for item_id in p_item_ids if self.hg.edges.get(item_id)]
-        p_clif_parts = [p for p in p_clif_parts if p]
+        p_clif_parts = []
+        for item_id in p_item_ids:
+            if self.hg.edges.get(item_id):
+                part = yield self._visit_item(item_id)
+                if part: p_clif_parts.append(part)
         
         p_part = f"(and {' '.join(p_clif_parts)})" if len(p_clif_parts) > 1 else p_clif_parts[0] if p_clif_parts else ""
         return f"(if {p_part} {q_part})"
 
-    def _reconstruct_or(self, edge: Hyperedge) -> str:
+    def _reconstruct_or(self, edge: Hyperedge) -> Step:
         """Reconstructs an (or ...) statement from its (not (and (not P) (not Q))) form."""
-        items_in_context = self.hg.get_items_in_context(edge.id)
+        items_in_context = self.hg.iter_items_in_context(edge.id)
         
         disjunct_parts = []
         for item_id in items_in_context:
             item = self.hg.edges.get(item_id)
             if item and item.type == 'cut':
                 # The content of the inner cut is the disjunct
-                disjunct_content = self._visit_context(item.id)
+                disjunct_content = yield self._visit_context(item.id)
                 disjunct_parts.append(disjunct_content)
             else:
                 # This would be unexpected for a valid 'or' structure
@@ -86,3 +86,66 @@ def test_specific_forall_implication():
 # and then run pytest from your project's root directory.
 # Example:
 # (EG-HG) % pytest
+
+def test_constants_are_shared_within_a_context():
+    """
+    Tests that repeated references to a constant reuse one node per context,
+    while the same name inside a cut gets its own node.
+    """
+    hg = ClifToHypergraph().translate("(and (P a) (Q a) (not (R a)))")
+
+    constants = [n for n in hg.nodes.values() if n.type == 'constant']
+    assert len(constants) == 2, "One 'a' on the SA and one inside the cut"
+    p_pred = [e for e in hg.edges.values() if e.properties.get('name') == 'P'][0]
+    q_pred = [e for e in hg.edges.values() if e.properties.get('name') == 'Q'][0]
+    assert p_pred.nodes == q_pred.nodes
+
+def test_parser_produces_nested_lists():
+    """Tests the s-expression parser on strings, numbers and nesting."""
+    from clif_to_hypergraph import _parse_sexpr
+    assert _parse_sexpr('(Age "Socrates" 70.5 (= x y))') == ['Age', 'Socrates', '70.5', ['=', 'x', 'y']]
+
+@pytest.mark.parametrize("clif", ["(P x", "(P x))", "(P #)", "(P) (Q)"])
+def test_malformed_clif_is_rejected(clif):
+    """Tests that unbalanced or unlexable input raises a ValueError."""
+    with pytest.raises(ValueError):
+        ClifToHypergraph().translate(clif)
+
+def test_deeply_nested_negations():
+    """Tests that nesting far beyond the recursion limit still translates."""
+    clif = "(P)"
+    for _ in range(3000):
+        clif = f"(not {clif})"
+    hg = ClifToHypergraph().translate(clif)
+
+    assert len(hg.edges) == 3001
+    predicate = [e for e in hg.edges.values() if e.type == 'predicate'][0]
+    assert hg.get_context_depth(predicate.id) == 3000
+
+def test_standalone_atom_logs_warning(caplog):
+    """Tests that a bare atom is reported through logging and adds nothing."""
+    with caplog.at_level("WARNING", logger="clif_to_hypergraph"):
+        hg = ClifToHypergraph().translate("Socrates")
+
+    assert not hg.nodes and not hg.edges
+    assert "Standalone atom found: Socrates" in caplog.text
+
+def test_empty_string_term_is_rejected():
+    """Tests that an empty string literal is not accepted as a constant or function name."""
+    with pytest.raises(ValueError, match="Invalid term structure"):
+        ClifToHypergraph().translate('(P "")')
+    with pytest.raises(ValueError, match="Invalid term structure"):
+        ClifToHypergraph().translate('(P ("" a))')
+
+def test_one_element_lists_stand_for_their_atom():
+    """Tests that (F) as a term is the constant F and (P) as an operator is the predicate P."""
+    from hypergraph_to_clif import HypergraphToClif
+    hg = ClifToHypergraph().translate("(R (F) a)")
+    assert sorted(node.properties['name'] for node in hg.nodes.values()) == ['F', 'a']
+    assert not any(edge.type == 'function' for edge in hg.edges.values())
+    assert HypergraphToClif(hg).translate() == "(R F a)"
+
+    hg = ClifToHypergraph().translate("((P) a)")
+    assert HypergraphToClif(hg).translate() == "(P a)"
+    hg = ClifToHypergraph().translate("(exists ((x)) (P x))")
+    assert HypergraphToClif(hg).translate() == "(exists (x) (P x))"
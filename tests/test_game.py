@@ -85,3 +85,42 @@ def test_start_inning_with_nonexistent_domain_model_fails():
     with pytest.raises(ValueError, match="not found in folio"):
         game.start_inning(thesis_graph=thesis, domain_model_name="Atlantis")
 
+def test_folio_graphs_are_frozen_and_shared():
+    """
+    Tests that the folio stores graphs by reference, freezes them, and hands
+    the same read-only graph to every inning.
+    """
+    game = EndoporeuticGame()
+    domain_model = EGHg()
+    domain_model.add_node(Node('constant', {'name': 'Socrates'}))
+    game.add_to_folio("Greek Philosophy", domain_model)
+
+    assert game.folio["Greek Philosophy"] is domain_model
+    with pytest.raises(ValueError, match="frozen"):
+        domain_model.add_node(Node('constant', {'name': 'Plato'}))
+
+    first = game.start_inning(thesis_graph=EGHg(), domain_model_name="Greek Philosophy")
+    second = game.start_inning(thesis_graph=EGHg(), domain_model_name="Greek Philosophy")
+    assert first.domain_model is second.domain_model is domain_model
+
+def test_folio_spills_cold_graphs():
+    """
+    Tests that a folio with a hot limit pickles the least recently used graphs
+    and revives them, still frozen, when an inning asks for them.
+    """
+    game = EndoporeuticGame(hot_limit=1)
+    for name in ("Greek Philosophy", "Logic"):
+        model = EGHg()
+        model.add_node(Node('constant', {'name': name}))
+        game.add_to_folio(name, model)
+
+    assert list(game.folio) == ["Logic"]
+    assert "Greek Philosophy" in game._cold
+    with pytest.raises(ValueError, match="already exists in the folio"):
+        game.add_to_folio("Greek Philosophy", EGHg())
+
+    session = game.start_inning(thesis_graph=EGHg(), domain_model_name="Greek Philosophy")
+    revived = session.domain_model
+    assert revived.frozen
+    assert [n.properties['name'] for n in revived.nodes.values()] == ["Greek Philosophy"]
+    assert list(game.folio) == ["Greek Philosophy"] and "Logic" in game._cold
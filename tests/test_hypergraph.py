@@ -0,0 +1,366 @@
+"""
+test_hypergraph.py
+
+This script contains a suite of pytest-based tests for the EGHg model itself,
+covering the bookkeeping that the translators and transformations rely on.
+"""
+
+import pytest
+from eg_hypergraph import EGHg, Node, Hyperedge
+
+def test_add_nodes_in_bulk():
+    """Tests that a batch of nodes is added in order to a single container."""
+    hg = EGHg()
+    cut = hg.add_edge(Hyperedge('cut', nodes=[]))
+    nodes = [Node('variable', {'name': name}) for name in ('x', 'y', 'z')]
+
+    added = hg.add_nodes(nodes, container=cut)
+
+    assert added == nodes
+    assert hg.get_items_in_context(cut.id) == [n.id for n in nodes]
+    assert all(hg.containment[n.id] == cut.id for n in nodes)
+
+def test_add_nodes_rejects_existing_ids():
+    """Tests that a failed bulk insert leaves the graph untouched."""
+    hg = EGHg()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    y = Node('variable', {'name': 'y'})
+
+    with pytest.raises(ValueError, match="already exist"):
+        hg.add_nodes([y, x])
+    assert y.id not in hg.nodes
+    assert hg.get_items_in_context(None) == [x.id]
+
+def test_clone_is_independent():
+    """Tests that a clone keeps all IDs but shares no mutable state."""
+    hg = EGHg()
+    cut = hg.add_edge(Hyperedge('cut', nodes=[]))
+    x = hg.add_node(Node('variable', {'name': 'x'}), container=cut)
+    cat = hg.add_edge(Hyperedge('predicate', [x.id], {'name': 'Cat'}), container=cut)
+
+    copy_hg = hg.clone()
+    assert copy_hg.get_items_in_context(cut.id) == [x.id, cat.id]
+    assert copy_hg.containment == hg.containment
+
+    copy_hg.add_node(Node('variable', {'name': 'y'}), container=copy_hg.edges[cut.id])
+    copy_hg.nodes[x.id].properties['name'] = 'z'
+    assert len(hg.get_items_in_context(cut.id)) == 2
+    assert hg.nodes[x.id].properties['name'] == 'x'
+
+def test_add_cut_shares_empty_node_sequence():
+    """Tests that cuts are created empty and share one empty node sequence."""
+    hg = EGHg()
+    outer = hg.add_cut(props={'clif_construct': 'or'})
+    inner = hg.add_cut(outer)
+
+    assert hg.get_items_in_context(outer.id) == [inner.id]
+    assert outer.properties == {'clif_construct': 'or'}
+    assert outer.nodes == () and outer.nodes is inner.nodes
+
+def test_copies_of_frozen_graph_are_mutable():
+    """Tests that clones and deep copies of a frozen graph can be edited."""
+    import copy
+    hg = EGHg()
+    hg.add_node(Node('constant', {'name': 'Socrates'}))
+    hg.freeze()
+
+    for copy_hg in (hg.clone(), copy.deepcopy(hg)):
+        assert not copy_hg.frozen
+        copy_hg.add_cut()
+    assert len(hg.edges) == 0
+
+def test_sa_items_are_indexed_in_order():
+    """Tests that SA queries come from the maintained index, in insertion order."""
+    hg = EGHg()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    cut = hg.add_cut()
+    y = hg.add_node(Node('variable', {'name': 'y'}), container=cut)
+    cat = hg.add_edge(Hyperedge('predicate', [x.id], {'name': 'Cat'}))
+
+    assert hg.get_items_in_context(None) == [x.id, cut.id, cat.id]
+    assert y.id not in hg.get_items_in_context(None)
+
+def test_move_and_remove_items():
+    """Tests re-parenting an item and removing items from their context."""
+    hg = EGHg()
+    cut = hg.add_cut()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+
+    hg.move_item(x.id, cut.id)
+    assert hg.containment[x.id] == cut.id
+    assert hg.get_items_in_context(None) == [cut.id]
+    assert hg.get_items_in_context(cut.id) == [x.id]
+
+    with pytest.raises(ValueError, match="still contains items"):
+        hg.remove_item(cut.id)
+    hg.remove_item(x.id)
+    hg.remove_item(cut.id)
+    assert not hg.nodes and not hg.edges and not hg.containment
+    assert hg.get_items_in_context(None) == []
+
+def test_context_depth_cache_follows_moves():
+    """Tests that cached depths are filled along the path and refreshed on moves."""
+    hg = EGHg()
+    outer = hg.add_cut()
+    inner = hg.add_cut(outer)
+    x = hg.add_node(Node('variable', {'name': 'x'}), container=inner)
+
+    assert hg.get_context_depth(x.id) == 2
+    assert hg.get_context_depth(inner.id) == 1
+    assert hg.get_context_depth(outer.id) == 0
+
+    hg.move_item(inner.id, None)
+    assert hg.get_context_depth(inner.id) == 0
+    assert hg.get_context_depth(x.id) == 1
+
+def test_edges_on_node_index():
+    """Tests that the node-to-edges index follows edge insertion and removal."""
+    hg = EGHg()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    y = hg.add_node(Node('variable', {'name': 'y'}))
+    cat = hg.add_edge(Hyperedge('predicate', [x.id], {'name': 'Cat'}))
+    loves = hg.add_edge(Hyperedge('predicate', [x.id, x.id], {'name': 'Loves'}))
+
+    assert list(hg.edges_on_node(x.id)) == [cat.id, loves.id]
+    assert list(hg.edges_on_node(y.id)) == []
+
+    clone = hg.clone()
+    hg.remove_item(loves.id)
+    assert list(hg.edges_on_node(x.id)) == [cat.id]
+    assert list(clone.edges_on_node(x.id)) == [cat.id, loves.id]
+
+def test_add_edge_reports_missing_nodes():
+    """Tests that add_edge names every missing node and leaves the graph unchanged."""
+    hg = EGHg()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    with pytest.raises(ValueError, match="non-existent nodes"):
+        hg.add_edge(Hyperedge('predicate', [x.id, -1, -2], {'name': 'R'}))
+    assert not hg.edges
+
+def test_add_to_missing_container_changes_nothing():
+    """Tests that adding into a container that is not in the graph is rejected up front."""
+    hg = EGHg()
+    stray_cut = Hyperedge('cut', [])
+    with pytest.raises(ValueError, match="does not exist"):
+        hg.add_node(Node('variable', {'name': 'x'}), container=stray_cut)
+    with pytest.raises(ValueError, match="does not exist"):
+        hg.add_edge(Hyperedge('cut', []), container=stray_cut)
+    assert not hg.nodes and not hg.edges and not hg.containment
+
+def test_ancestors_and_scope():
+    """Tests cached ancestor sets and the scope checks built on them."""
+    hg = EGHg()
+    outer = hg.add_cut()
+    inner = hg.add_cut(outer)
+    x = hg.add_node(Node('variable', {'name': 'x'}), container=inner)
+
+    assert hg.ancestors(x.id) == {outer.id, inner.id}
+    assert hg.ancestors(inner.id) == {outer.id}
+    assert hg.ancestors(outer.id) == frozenset()
+    assert hg.is_in_scope(x.id, outer.id) and hg.is_in_scope(x.id, None)
+    assert hg.is_ancestor(outer.id, inner.id) and not hg.is_ancestor(inner.id, outer.id)
+
+    hg.move_item(x.id, outer.id)
+    assert hg.ancestors(x.id) == {outer.id}
+    assert not hg.is_in_scope(x.id, inner.id)
+
+def test_get_items_in_context_returns_a_copy():
+    """Tests that get_items_in_context copies while iter_items_in_context does not."""
+    hg = EGHg()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    items = hg.get_items_in_context(None)
+    items.append(-1)
+    assert hg.get_items_in_context(None) == [x.id]
+    assert hg.iter_items_in_context(None) is hg.sa_contained_items
+
+def test_max_depth_tracks_structure():
+    """Tests that the cached maximum depth is refreshed after structural changes."""
+    hg = EGHg()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    assert hg.max_depth() == 0 and hg.get_context_depth(x.id) == 0
+
+    outer = hg.add_cut()
+    inner = hg.add_cut(outer)
+    assert hg.max_depth() == 1
+    hg.move_item(x.id, inner.id)
+    assert hg.max_depth() == 2
+    hg.remove_item(x.id)
+    assert hg.max_depth() == 1
+
+def test_add_edges_in_bulk():
+    """Tests adding a batch of edges, and that a bad batch changes nothing."""
+    hg = EGHg()
+    cut = hg.add_cut()
+    x = hg.add_node(Node('variable', {'name': 'x'}), container=cut)
+    edges = hg.add_edges([Hyperedge('predicate', [x.id], {'name': name}) for name in ('Cat', 'Mat')], container=cut)
+
+    assert hg.get_items_in_context(cut.id) == [x.id] + [e.id for e in edges]
+    assert list(hg.edges_on_node(x.id)) == [e.id for e in edges]
+    assert all(hg.containment[e.id] == cut.id for e in edges)
+
+    with pytest.raises(ValueError, match="non-existent nodes"):
+        hg.add_edges([Hyperedge('predicate', [x.id]), Hyperedge('predicate', [-1])])
+    with pytest.raises(ValueError, match="already exist"):
+        hg.add_edges([Hyperedge('predicate', [x.id]), edges[0]])
+    assert len(hg.edges) == 3
+
+def test_hyperedge_repr_and_describe():
+    """Tests the short repr and the full description of an edge."""
+    edge = Hyperedge('predicate', [1, 2], {'name': 'Loves'}, edge_id=7)
+    assert repr(edge) == "Hyperedge(id=7, type='predicate', arity=2)"
+    assert edge.describe() == "Hyperedge(id=7, type='predicate', nodes=[1, 2], props={'name': 'Loves'})"
+
+def test_builder_matches_incremental_construction():
+    """Tests that EGHgBuilder produces the same contexts and indexes as add_node/add_edge."""
+    from eg_hypergraph import EGHgBuilder
+    builder = EGHgBuilder()
+    x = builder.add_node(Node('variable', {'name': 'x'}))
+    cut = builder.add_edge(Hyperedge('cut', []))
+    cat = builder.add_edge(Hyperedge('predicate', [x.id], {'name': 'Cat'}), container=cut)
+    hg = builder.build(freeze=True)
+
+    assert hg.frozen
+    assert hg.get_items_in_context(None) == [x.id, cut.id]
+    assert hg.get_items_in_context(cut.id) == [cat.id]
+    assert hg.get_context_depth(cat.id) == 1
+    assert list(hg.edges_on_node(x.id)) == [cat.id]
+
+    bad = EGHgBuilder()
+    bad.add_edge(Hyperedge('predicate', [-1]))
+    with pytest.raises(ValueError, match="non-existent nodes"):
+        bad.build()
+
+def test_fork_shares_until_written():
+    """Tests that a fork shares unchanged objects and copies only what either side edits."""
+    hg = EGHg()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    cut = hg.add_cut()
+    other_cut = hg.add_cut()
+    cat = hg.add_edge(Hyperedge('predicate', [x.id], {'name': 'Cat'}), container=cut)
+
+    fork = hg.fork()
+    assert fork.edges[cut.id] is hg.edges[cut.id]
+
+    fork.add_edge(Hyperedge('predicate', [x.id], {'name': 'Mat'}), container=cut)
+    fork.move_item(cat.id, None)
+    assert hg.get_items_in_context(cut.id) == [cat.id]
+    assert list(hg.edges_on_node(x.id)) == [cat.id]
+    assert hg.containment[cat.id] == cut.id
+    assert fork.edges[other_cut.id] is hg.edges[other_cut.id]
+
+    # The original is also protected from writes made after the fork.
+    hg.add_edge(Hyperedge('predicate', [x.id], {'name': 'Hat'}), container=cut)
+    assert len(fork.get_items_in_context(cut.id)) == 1
+    assert len(fork.edges_on_node(x.id)) == 2
+
+def test_move_keeps_unrelated_cached_depths():
+    """Tests that moving an item forgets only the cached depths of its own subtree."""
+    hg = EGHg()
+    outer = hg.add_cut()
+    inner = hg.add_cut(outer)
+    x = hg.add_node(Node('variable', {'name': 'x'}), container=inner)
+    other = hg.add_cut()
+    y = hg.add_node(Node('variable', {'name': 'y'}), container=other)
+    assert hg.get_context_depth(x.id) == 2 and hg.get_context_depth(y.id) == 1
+
+    hg.move_item(inner.id, other.id)
+    assert y.id in hg._depth_cache and outer.id in hg._depth_cache
+    assert x.id not in hg._depth_cache
+    assert hg.get_context_depth(x.id) == 2
+    assert hg.ancestors(x.id) == {other.id, inner.id}
+
+def test_remove_items_drops_nested_contents():
+    """Tests removing a cut with everything inside it, leaving the original of a fork intact."""
+    hg = EGHg()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    outer = hg.add_cut()
+    inner = hg.add_cut(outer)
+    cat = hg.add_edge(Hyperedge('predicate', [x.id], {'name': 'Cat'}), container=inner)
+    mat = hg.add_edge(Hyperedge('predicate', [x.id], {'name': 'Mat'}))
+
+    fork = hg.fork()
+    fork.remove_items([outer.id])
+    assert fork.get_items_in_context(None) == [x.id, mat.id]
+    assert set(fork.containment) == {x.id, mat.id}
+    assert list(fork.edges_on_node(x.id)) == [mat.id]
+
+    assert hg.get_items_in_context(inner.id) == [cat.id]
+    assert list(hg.edges_on_node(x.id)) == [cat.id, mat.id]
+    with pytest.raises(ValueError, match="not found"):
+        hg.remove_items([-1])
+
+def test_move_items_in_bulk():
+    """Tests moving several items from different contexts in one call."""
+    hg = EGHg()
+    cut = hg.add_cut()
+    target = hg.add_cut()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    y = hg.add_node(Node('variable', {'name': 'y'}), container=cut)
+    z = hg.add_node(Node('variable', {'name': 'z'}), container=cut)
+    assert hg.get_context_depth(y.id) == 1
+
+    hg.move_items([y.id, x.id, z.id], target.id)
+    assert hg.get_items_in_context(target.id) == [y.id, x.id, z.id]
+    assert hg.get_items_in_context(cut.id) == []
+    assert hg.get_items_in_context(None) == [cut.id, target.id]
+    assert all(hg.containment[i] == target.id for i in (x.id, y.id, z.id))
+    assert hg.get_context_depth(x.id) == 1
+
+def test_move_items_moves_repeated_ids_once():
+    """Tests that an ID listed twice is moved once and leaves the indexes consistent."""
+    hg = EGHg()
+    cut = hg.add_cut()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+
+    hg.move_items([x.id, x.id], cut.id)
+    assert hg.get_items_in_context(cut.id) == [x.id]
+    assert hg.get_items_in_context(None) == [cut.id]
+    assert hg.containment[x.id] == cut.id
+
+def test_move_into_own_contents_is_rejected():
+    """Tests that a cut cannot be moved into itself or a cut nested inside it."""
+    hg = EGHg()
+    outer = hg.add_cut()
+    inner = hg.add_cut(outer)
+
+    for target in (outer.id, inner.id):
+        with pytest.raises(ValueError, match="into itself"):
+            hg.move_item(outer.id, target)
+        with pytest.raises(ValueError, match="into themselves"):
+            hg.move_items([outer.id], target)
+    assert hg.get_items_in_context(None) == [outer.id]
+    assert hg.get_context_depth(inner.id) == 1
+
+def test_builder_rejects_what_add_edge_rejects():
+    """Tests that the builder refuses late or self containers and edges already holding items."""
+    from eg_hypergraph import EGHgBuilder
+    cut = Hyperedge('cut', [])
+    self_contained = EGHgBuilder()
+    self_contained.add_edge(cut, container=cut)
+    with pytest.raises(ValueError, match="does not exist"):
+        self_contained.build()
+
+    later = EGHgBuilder()
+    later.add_node(Node('variable'), container=cut)
+    later.add_edge(cut)
+    with pytest.raises(ValueError, match="does not exist"):
+        later.build()
+
+    hg = EGHg()
+    used = hg.add_cut()
+    hg.add_node(Node('variable'), container=used)
+    reused = EGHgBuilder()
+    reused.add_edge(used)
+    with pytest.raises(ValueError, match="already contains items"):
+        reused.build()
+    assert len(hg.get_items_in_context(used.id)) == 1
+
+def test_remove_item_drops_signature_index_of_removed_cut():
+    """Tests that removing a cut also drops the signature index built for its context."""
+    hg = EGHg()
+    cut = hg.add_cut()
+    hg.context_signatures(cut.id, lambda item_id: ())
+    assert cut.id in hg._context_signatures
+
+    hg.remove_item(cut.id)
+    assert cut.id not in hg._context_signatures
@@ -154,3 +154,11 @@ def test_all_cats_are_black():
     """Probes the common idiom for 'All X are Y'."""
     item = next(i for i in clif_corpus if "All cats are black" in i['description'])
     _perform_roundtrip_test(item)
+
+def test_deeply_nested_negations_roundtrip():
+    """Tests that nesting far beyond the recursion limit translates back to CLIF."""
+    clif = "(P a)"
+    for _ in range(3000):
+        clif = f"(not {clif})"
+    hg = ClifToHypergraph().translate(clif)
+    assert HypergraphToClif(hg).translate() == clif
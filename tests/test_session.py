@@ -135,15 +135,63 @@ def test_take_turn_updates_history():
 def test_invalid_turn_does_not_update_history():
     """Tests that an invalid transformation does not change the state."""
     hg = EGHg()
-    cut = hg.add_edge(Hyperedge('cut', nodes=[]))
-    predicate = hg.add_edge(Hyperedge('predicate', [], {'name': 'P'}), container=cut)
+    predicate = hg.add_edge(Hyperedge('predicate', [], {'name': 'P'}))
     
     session = EGSession(thesis_graph=hg)
     initial_graph = session.current_graph
     
-    # This erase is invalid because the context is negative.
+    # The thesis sits inside the session's negation cut, so this erase is
+    # invalid because the context is negative.
     success = session.apply_transformation('erase', item_ids=[predicate.id])
     
     assert not success
     assert len(session._history) == 1
     assert session.current_graph is initial_graph
+
+def test_remove_negation_promotes_contents_and_switches_player():
+    """Tests that removing the contested cut exposes its contents on the SA."""
+    thesis = EGHg()
+    inner_cut = thesis.add_edge(Hyperedge('cut', nodes=[]))
+    thesis.add_edge(Hyperedge('predicate', [], {'name': 'P'}), container=inner_cut)
+
+    session = EGSession(thesis_graph=thesis)
+    session.remove_negation()
+
+    graph = session.current_graph
+    sa_items = graph.get_items_in_context(None)
+    assert len(sa_items) == 1 and graph.edges[sa_items[0]].type == 'cut'
+    assert session.contested_context == sa_items[0]
+    assert session.player == Player.SKEPTIC
+    assert len(session._history) == 2
+    assert len(session._history[0].edges) == 3
+    # The previous state shares the fork's objects but is left untouched.
+    previous = session._history[0]
+    assert len(previous.get_items_in_context(None)) == 1
+    assert previous.edges[sa_items[0]] is graph.edges[sa_items[0]]
+
+def test_history_limit_drops_oldest_states():
+    """Tests that a bounded history keeps only the most recent states."""
+    session = EGSession(thesis_graph=EGHg(), history_limit=2)
+    for _ in range(3):
+        session.apply_transformation('add_double_cut', item_ids=[], container_id=session.contested_context)
+
+    assert len(session._history) == 2
+    assert session._history_index == 1
+    assert len(session.current_graph.edges) == 7
+    session.undo()
+    assert len(session.current_graph.edges) == 5
+    session.undo()
+    assert session._history_index == 0
+
+def test_session_forks_thesis_without_changing_it():
+    """Tests that the thesis keeps its item IDs inside the session and is itself left unchanged."""
+    thesis = EGHg()
+    x = thesis.add_node(Node('variable', {'name': 'x'}))
+    cat = thesis.add_edge(Hyperedge('predicate', [x.id], {'name': 'Cat'}))
+
+    session = EGSession(thesis_graph=thesis)
+    graph = session.current_graph
+    assert graph.get_items_in_context(session.contested_context) == [x.id, cat.id]
+    assert graph.get_items_in_context(None) == [session.contested_context]
+    assert thesis.get_items_in_context(None) == [x.id, cat.id]
+    assert thesis.containment[x.id] is None
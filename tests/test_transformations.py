@@ -22,6 +22,12 @@ def _verify_graph_integrity(hg: EGHg):
             container_edge = hg.edges.get(container_id)
             assert container_edge is not None, f"Item {item_id} points to non-existent container"
             assert item_id in container_edge.contained_items, f"Item {item_id} not in container's list"
+    sa_items = [item_id for item_id, container_id in hg.containment.items() if container_id is None]
+    assert sorted(hg.sa_contained_items) == sorted(sa_items), "SA index mismatch"
+    for edge_id, edge in hg.edges.items():
+        for node_id in edge.nodes:
+            if node_id in hg.nodes:
+                assert edge_id in hg.edges_on_node(node_id), "Incidence index mismatch"
     for container_id, container_edge in hg.edges.items():
         if container_edge.type == 'cut':
             for contained_item_id in container_edge.contained_items:
@@ -144,3 +150,150 @@ def test_iteration_reversibility():
     final_clif = HypergraphToClif(hg3).translate()
     assert final_clif == original_clif
     _verify_graph_integrity(hg3)
+
+def test_add_double_cut_rejects_items_from_different_contexts():
+    """Tests that a double cut cannot enclose items from two contexts, and the source is untouched."""
+    hg = EGHg()
+    cut = hg.add_cut()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    y = hg.add_node(Node('variable', {'name': 'y'}), container=cut)
+
+    with pytest.raises(ValueError, match="same container"):
+        EGTransformation(hg).add_double_cut([x.id, y.id])
+    assert hg.get_items_in_context(None) == [cut.id, x.id]
+    assert hg.get_items_in_context(cut.id) == [y.id]
+    _verify_graph_integrity(hg)
+
+def test_insert_deeply_nested_subgraph():
+    """Tests that inserting a deeply nested subgraph copies every level without recursion."""
+    main_hg = EGHg()
+    target_cut = main_hg.add_cut()
+    subgraph = EGHg()
+    x = subgraph.add_node(Node('variable', {'name': 'x'}))
+    container = None
+    for _ in range(3000):
+        container = subgraph.add_cut(container)
+    subgraph.add_edge(Hyperedge('predicate', [x.id], {'name': 'Deep'}), container=container)
+
+    new_hg = EGTransformation(main_hg).insert(subgraph, target_cut.id)
+
+    assert len(new_hg.edges) == 1 + 3000 + 1
+    deep = next(edge for edge in new_hg.edges.values() if edge.properties.get('name') == 'Deep')
+    assert new_hg.get_context_depth(deep.id) == 3001
+    assert new_hg.containment[deep.nodes[0]] == target_cut.id
+    _verify_graph_integrity(new_hg)
+
+def test_deiterate_requires_a_match_and_caches_signatures():
+    """Tests that deiteration needs an identical edge outside, reusing cached signatures across forks."""
+    hg = EGHg()
+    x_node = hg.add_node(Node('variable', {'name': 'x'}))
+    p_pred = hg.add_edge(Hyperedge('predicate', [x_node.id], {'name': 'P'}))
+    cut = hg.add_cut()
+    q_pred = hg.add_edge(Hyperedge('predicate', [x_node.id], {'name': 'Q'}), container=cut)
+
+    with pytest.raises(ValueError, match="no identical graph"):
+        EGTransformation(hg).deiterate([q_pred.id])
+    assert p_pred.id in hg._signature_cache
+
+    hg2 = EGTransformation(hg).iterate([p_pred.id], target_container_id=cut.id)
+    assert p_pred.id in hg2._signature_cache
+    assert hg2._signature_cache is not hg._signature_cache
+    # Erasing an item drops its signature from the erasing graph only.
+    hg3 = EGTransformation(hg2).erase([p_pred.id])
+    assert p_pred.id not in hg3._signature_cache and p_pred.id in hg2._signature_cache
+
+def test_context_signature_index_is_refreshed():
+    """Tests that a context's signature index is rebuilt after the context changes."""
+    hg = EGHg()
+    x_node = hg.add_node(Node('variable', {'name': 'x'}))
+    cut = hg.add_cut()
+    q_pred = hg.add_edge(Hyperedge('predicate', [x_node.id], {'name': 'Q'}), container=cut)
+
+    with pytest.raises(ValueError, match="no identical graph"):
+        EGTransformation(hg).deiterate([q_pred.id])
+    assert None in hg._context_signatures
+
+    hg.add_edge(Hyperedge('predicate', [x_node.id], {'name': 'Q'}))
+    assert None not in hg._context_signatures
+    new_hg = EGTransformation(hg).deiterate([q_pred.id])
+    assert q_pred.id not in new_hg.edges
+    _verify_graph_integrity(new_hg)
+
+def test_iterate_cut_copies_nested_contents():
+    """Tests that iterating a cut copies its whole contents, keeping links to outer nodes."""
+    hg = EGHg()
+    x_node = hg.add_node(Node('variable', {'name': 'x'}))
+    cut = hg.add_cut()
+    hg.add_edge(Hyperedge('predicate', [x_node.id], {'name': 'P'}), container=cut)
+    inner = hg.add_cut(cut)
+    hg.add_edge(Hyperedge('predicate', [x_node.id], {'name': 'Q'}), container=inner)
+    target = hg.add_cut()
+
+    new_hg = EGTransformation(hg).iterate([cut.id], target_container_id=target.id)
+
+    copied_cut = new_hg.get_items_in_context(target.id)[0]
+    copied_items = new_hg.get_items_in_context(copied_cut)
+    assert [new_hg.edges[i].type for i in copied_items] == ['predicate', 'cut']
+    copied_q = new_hg.get_items_in_context(copied_items[1])[0]
+    assert new_hg.edges[copied_q].nodes == [x_node.id]
+    assert len(new_hg.edges_on_node(x_node.id)) == 4
+    _verify_graph_integrity(new_hg)
+
+def test_single_item_signature_matches_general_path():
+    """Tests that the single-item signature shortcut agrees with the general builder."""
+    hg = EGHg()
+    x_node = hg.add_node(Node('variable', {'name': 'x'}))
+    y_node = hg.add_node(Node('variable', {'name': 'y'}))
+    r_pred = hg.add_edge(Hyperedge('predicate', [y_node.id, x_node.id], {'name': 'R'}))
+    cut = hg.add_cut()
+
+    t = EGTransformation(hg)
+    # -1 is not an item of the graph; it only forces the general path.
+    for item_id in (x_node.id, r_pred.id, cut.id):
+        assert t._build_canonical_signature([item_id]) == t._build_canonical_signature([item_id, -1])
+    assert t._build_canonical_signature([x_node.id]) == ()
+
+def test_invalid_double_cut_input_is_rejected_before_forking():
+    """Tests that double cut rules validate on the source graph, so a failure never forks it."""
+    hg = EGHg()
+    cut = hg.add_cut()
+    x = hg.add_node(Node('variable', {'name': 'x'}))
+    y = hg.add_node(Node('variable', {'name': 'y'}), container=cut)
+    t = EGTransformation(hg)
+
+    with pytest.raises(ValueError, match="same container"):
+        t.add_double_cut([x.id, y.id])
+    with pytest.raises(ValueError, match="does not match"):
+        t.add_double_cut([x.id], container_id=cut.id)
+    with pytest.raises(ValueError, match="not a cut itself"):
+        t.remove_double_cut(cut.id)
+    # Forking would have marked the source graph as shared.
+    assert hg._owned is None
+
+def test_clone_signatures_do_not_leak_into_original():
+    """Tests that a clone whose properties are edited cannot vouch for a deiteration in the original."""
+    import copy
+    hg = EGHg()
+    x_node = hg.add_node(Node('variable', {'name': 'x'}))
+    p_pred = hg.add_edge(Hyperedge('predicate', [x_node.id], {'name': 'P'}))
+    cut = hg.add_cut()
+    q_pred = hg.add_edge(Hyperedge('predicate', [x_node.id], {'name': 'Q'}), container=cut)
+
+    copy_hg = copy.deepcopy(hg)
+    copy_hg.edges[p_pred.id].properties['name'] = 'Q'
+    EGTransformation(copy_hg).deiterate([q_pred.id])
+
+    with pytest.raises(ValueError, match="no identical graph"):
+        EGTransformation(hg).deiterate([q_pred.id])
+
+def test_add_double_cut_without_items():
+    """Tests that add_double_cut with no item list adds an empty double cut."""
+    hg = EGHg()
+    cut = hg.add_cut()
+
+    for item_ids in (None, []):
+        new_hg = EGTransformation(hg).add_double_cut(item_ids, container_id=cut.id)
+        outer_cut_id = new_hg.get_items_in_context(cut.id)[0]
+        inner_cut_id = new_hg.get_items_in_context(outer_cut_id)[0]
+        assert new_hg.get_items_in_context(inner_cut_id) == []
+        _verify_graph_integrity(new_hg)